@@ -14,6 +14,7 @@ class EnvVarNames(Enum):
     LOGGING_PORT = "TANGO_LOGGING_PORT"
     LOGGING_PREFIX = "TANGO_LOGGING_PREFIX"
     CONSOLE_WIDTH = "TANGO_CONSOLE_WIDTH"
+    DEFAULT_COMPRESSION = "TANGO_DEFAULT_COMPRESSION"
 
     @classmethod
     def values(cls) -> Set[str]:
@@ -70,6 +70,26 @@ class Format(Registrable, Generic[T]):
         return params_dict
 
 
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ConfigurationError(
+            "zstd compression requires the 'zstandard' package. "
+            "You can install it with 'pip install zstandard'."
+        )
+    return zstandard
+
+
+def _zstd_open(filename: PathLike, mode: str) -> IO:
+    zstandard = _import_zstandard()
+    if "r" in mode:
+        return zstandard.open(filename, mode)
+    else:
+        # Unlike gzip, zstd can use all available cores to compress.
+        return zstandard.open(filename, mode, cctx=zstandard.ZstdCompressor(level=3, threads=-1))
+
+
 _OPEN_FUNCTIONS: Dict[Optional[str], Callable[[PathLike, str], IO]] = {
     None: open,
     "None": open,
@@ -82,6 +102,8 @@ _OPEN_FUNCTIONS: Dict[Optional[str], Callable[[PathLike, str], IO]] = {
     "bzip": bz2.open,  # type: ignore
     "bzip2": bz2.open,  # type: ignore
     "lzma": lzma.open,
+    "zst": _zstd_open,
+    "zstd": _zstd_open,
 }
 
 _SUFFIXES: Dict[Callable, str] = {
@@ -89,9 +111,18 @@ _SUFFIXES: Dict[Callable, str] = {
     gzip.open: ".gz",
     bz2.open: ".bz2",
     lzma.open: ".xz",
+    _zstd_open: ".zst",
 }
 
 
+def _check_compression(compress: Optional[str]) -> None:
+    if compress not in _OPEN_FUNCTIONS:
+        raise ConfigurationError(f"The {compress} compression format does not exist.")
+    if _OPEN_FUNCTIONS[compress] is _zstd_open:
+        # Fail now rather than when the first result is written.
+        _import_zstandard()
+
+
 def _open_compressed(filename: PathOrStr, mode: str) -> IO:
     open_fn: Callable
     filename = str(filename)
@@ -115,13 +146,16 @@ class DillFormat(Format[T], Generic[T]):
         This format has special support for iterables. If you write an iterator, it will consume the
         iterator. If you read an iterator, it will read the iterator lazily.
 
+    .. tip::
+        ``compress="zstd"`` is usually several times faster than ``"gz"`` at a similar ratio,
+        but requires the ``zstandard`` package.
+
     """
 
     VERSION = "001"
 
     def __init__(self, compress: Optional[str] = None):
-        if compress not in _OPEN_FUNCTIONS:
-            raise ConfigurationError(f"The {compress} compression format does not exist.")
+        _check_compression(compress)
         self.compress = compress
 
     def write(self, artifact: T, dir: PathOrStr):
@@ -203,8 +237,7 @@ class JsonFormat(Format[T], Generic[T]):
 
     def __init__(self, compress: Optional[str] = None):
         self.logger = logging.getLogger(self.__class__.__name__)
-        if compress not in _OPEN_FUNCTIONS:
-            raise ConfigurationError(f"The {compress} compression format does not exist.")
+        _check_compression(compress)
         self.compress = compress
 
     @staticmethod
@@ -340,8 +373,7 @@ class TextFormat(Format[Union[str, Iterable[str]]]):
 
     def __init__(self, compress: Optional[str] = None):
         self.logger = logging.getLogger(self.__class__.__name__)
-        if compress not in _OPEN_FUNCTIONS:
-            raise ConfigurationError(f"The {compress} compression format does not exist.")
+        _check_compression(compress)
         self.compress = compress
 
     def write(self, artifact: Union[str, Iterable[str]], dir: PathOrStr):
@@ -7,6 +7,8 @@ import torch
 from tango.common.aliases import PathOrStr
 from tango.format import Format
 
+from .util import mmap_load
+
 T = TypeVar("T")
 
 
@@ -17,6 +19,9 @@ class TorchFormat(Format[T], Generic[T]):
 
     Unlike :class:`tango.format.DillFormat`, this has no special support for iterators.
 
+    When reading, the file is memory-mapped if the installed version of PyTorch supports it,
+    so tensors are only paged in from disk when they are actually used.
+
     .. tip::
 
         Registered as a :class:`~tango.format.Format` under the name "torch".
@@ -32,10 +37,9 @@ class TorchFormat(Format[T], Generic[T]):
 
     def read(self, dir: PathOrStr) -> T:
         filename = Path(dir) / "data.pt"
-        with open(filename, "rb") as f:
-            version, artifact = torch.load(f, pickle_module=dill, map_location=torch.device("cpu"))
-            if version > self.VERSION:
-                raise ValueError(
-                    f"File {filename} is too recent for this version of {self.__class__}."
-                )
-            return artifact
+        version, artifact = mmap_load(
+            filename, pickle_module=dill, map_location=torch.device("cpu")
+        )
+        if version > self.VERSION:
+            raise ValueError(f"File {filename} is too recent for this version of {self.__class__}.")
+        return artifact
@@ -2,8 +2,10 @@ import logging
 import math
 import os
 import shutil
+from collections import deque
+from contextlib import closing
 from itertools import islice
-from typing import Any, Dict, List, Optional, Set, Union, cast
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, Union, cast
 
 import more_itertools
 import torch
@@ -27,7 +29,14 @@ from .model import Model
 from .train_callback import TrainCallback
 from .train_config import TrainConfig
 from .training_engine import TrainingEngine
-from .util import check_dataloader, check_dataset, set_seed_all
+from .util import (
+    check_dataloader,
+    check_dataset,
+    mmap_load,
+    prefetch_to_device,
+    set_seed_all,
+    tune_dataloader,
+)
 
 
 @Step.register("torch::train")
@@ -275,6 +284,13 @@ class TorchTrainStep(Step):
                     "'checkpoint_every' needs to be multiple of 'validate_every' or vice versa"
                 )
 
+        for split in (train_split, validation_split):
+            if split is not None and split not in dataset_dict:
+                raise ConfigurationError(
+                    f"There is no '{split}' split in the dataset dict. "
+                    f"Available splits are {', '.join(map(repr, dataset_dict.keys()))}."
+                )
+
         config = TrainConfig(
             self.unique_id,
             self.work_dir,
@@ -343,7 +359,7 @@ class TorchTrainStep(Step):
             self.logger.info(
                 f"Loading best weights from {str(config.final_weights_path.resolve())}"
             )
-            state = torch.load(config.final_weights_path, map_location="cpu")
+            state = mmap_load(config.final_weights_path, map_location="cpu")
             # We use `strict=False` because there might be missing keys due to weight tying.
             final_model.load_state_dict(state, strict=False)
 
@@ -405,6 +421,9 @@ def _train(
     train_dataset = dataset_dict[config.train_split]
     check_dataset(train_dataset, config.train_split)
     train_dataloader: DataLoader = train_dataloader.construct(dataset=train_dataset)
+    tune_dataloader(train_dataloader, device)
+    if validation_dataloader is not None:
+        tune_dataloader(validation_dataloader, device)
 
     if config.train_steps is None:
         assert config.train_epochs is not None
@@ -475,12 +494,15 @@ def _train(
     del initial_state
 
     training_engine.model.train()
-    training_batches = enumerate(
-        islice(
-            _cycle_through_epochs(train_dataloader, config.is_distributed, config.grad_accum),
-            config.train_steps,
-        )
+    epoch_batches = _cycle_through_epochs(
+        train_dataloader,
+        config.is_distributed,
+        config.grad_accum,
+        device,
+        # The batches we're catching up on aren't used, so don't copy them to the device.
+        skip_steps=start_step,
     )
+    training_batches = enumerate(islice(epoch_batches, config.train_steps))
 
     def is_best_checkpoint() -> bool:
         """
@@ -574,7 +596,7 @@ def _train(
             total=start_step - 1,
             disable=not config.is_local_main_process,
         ) as batch_iter:
-            for step, (current_epoch, batch) in batch_iter:
+            for step, (current_epoch, batch, _) in batch_iter:
                 del batch
                 if step >= start_step - 1:
                     break
@@ -594,7 +616,7 @@ def _train(
     )
     train_batch_iterator = more_itertools.peekable(train_batch_iterator_tqdm)
     try:
-        for step, (epoch, batch) in train_batch_iterator:
+        for step, (epoch, batch, micro_batches) in train_batch_iterator:
             if epoch != current_epoch:
                 # Start of new epoch.
                 if epoch > 0:
@@ -610,7 +632,7 @@ def _train(
                 callback.pre_batch(step, current_epoch, batch)
             batch_loss = 0.0
             batch_outputs = []
-            for micro_batch_idx, micro_batch in enumerate(batch):
+            for micro_batch_idx, micro_batch in enumerate(micro_batches):
                 # Get loss.
                 micro_batch_loss, micro_batch_outputs = training_engine.forward_train(
                     micro_batch, micro_batch_idx, len(batch)
@@ -638,6 +660,7 @@ def _train(
                 callback.post_batch(step, current_epoch, batch_loss, batch_outputs)
 
             del batch
+            del micro_batches
 
             training_engine.step()
 
@@ -689,8 +712,11 @@ def _train(
                 training_engine.model.eval()
 
                 running_metric = 0.0
-                with Tqdm.tqdm(
-                    islice(validation_dataloader, config.validation_steps),
+                # We likely won't exhaust the data loader, so we have to stop prefetching explicitly.
+                with closing(
+                    prefetch_to_device(validation_dataloader, device)
+                ) as val_batches, Tqdm.tqdm(
+                    islice(val_batches, config.validation_steps),
                     desc="Validating",
                     total=config.validation_steps,
                     leave=False,
@@ -781,6 +807,8 @@ def _train(
             logger.info("Stopping early!")
     finally:
         train_batch_iterator_tqdm.close()
+        # Stop prefetching and release the data loader's workers before the final checkpointing.
+        epoch_batches.close()
 
     if config.is_distributed:
         dist.barrier()
@@ -807,11 +835,51 @@ def _train(
         return None
 
 
-def _cycle_through_epochs(dataloader: DataLoader, is_distributed: bool, grad_accum: int):
-    epoch = 0
-    while True:
-        if is_distributed and isinstance(dataloader.sampler, DistributedSampler):
-            dataloader.sampler.set_epoch(epoch)
-        for batch in chunked(dataloader, grad_accum):
-            yield epoch, batch
-        epoch += 1
+def _cycle_through_epochs(
+    dataloader: DataLoader,
+    is_distributed: bool,
+    grad_accum: int,
+    device: torch.device,
+    skip_steps: int = 0,
+):
+    """
+    Yields ``(epoch, batch, micro_batches)`` for every optimization step, where ``batch`` is the
+    list of micro-batches as they come out of the data loader and ``micro_batches`` iterates over
+    the same micro-batches on ``device``. ``micro_batches`` has to be exhausted before moving on
+    to the next step.
+
+    The micro-batches are prefetched to the device one at a time, except for the first
+    ``skip_steps`` steps, which are never copied to the device.
+    """
+    # Records (epoch, batch) for the steps whose micro-batches have started going to the device.
+    pending: Deque[Tuple[int, List[Any]]] = deque()
+
+    def cycle():
+        epoch = 0
+        while True:
+            if is_distributed and isinstance(dataloader.sampler, DistributedSampler):
+                dataloader.sampler.set_epoch(epoch)
+            for batch in chunked(dataloader, grad_accum):
+                yield epoch, batch
+            epoch += 1
+
+    def flatten(epoch_batches):
+        for epoch, batch in epoch_batches:
+            pending.append((epoch, batch))
+            yield from batch
+
+    def step_micro_batches(first_micro_batch, device_micro_batches, num_micro_batches: int):
+        yield first_micro_batch
+        del first_micro_batch
+        yield from islice(device_micro_batches, num_micro_batches - 1)
+
+    epoch_batches = cycle()
+    for epoch, batch in islice(epoch_batches, skip_steps):
+        yield epoch, batch, iter(())
+
+    with closing(prefetch_to_device(flatten(epoch_batches), device)) as device_micro_batches:
+        for first_micro_batch in device_micro_batches:
+            epoch, batch = pending.popleft()
+            micro_batches = step_micro_batches(first_micro_batch, device_micro_batches, len(batch))
+            del first_micro_batch
+            yield epoch, batch, micro_batches
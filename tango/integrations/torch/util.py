@@ -1,30 +1,148 @@
+import inspect
+import queue
 import random
+import threading
 import warnings
 from collections import UserDict
-from typing import Dict, Optional, TypeVar, Union
+from typing import Any, Dict, Generator, Iterable, Optional, Tuple, TypeVar, Union
 
 import torch
 import torch.distributed as dist
 from torch.utils.data import DistributedSampler, IterableDataset
 
+from tango.common.aliases import PathOrStr
+
 from .data import DataLoader
 
 T = TypeVar("T")
 
+_TORCH_LOAD_SUPPORTS_MMAP = "mmap" in inspect.signature(torch.load).parameters
+
 
-def move_to_device(o: T, device: torch.device) -> T:
+def move_to_device(o: T, device: torch.device, non_blocking: bool = False) -> T:
     if isinstance(o, torch.Tensor):
-        return o.to(device)  # type: ignore[return-value]
+        return o.to(device, non_blocking=non_blocking)  # type: ignore[return-value]
     elif isinstance(o, dict) or isinstance(o, UserDict):
-        return {k: move_to_device(v, device) for k, v in o.items()}  # type: ignore[return-value]
+        return {k: move_to_device(v, device, non_blocking) for k, v in o.items()}  # type: ignore[return-value]
     elif isinstance(o, list):
-        return [move_to_device(x, device) for x in o]  # type: ignore[return-value]
+        return [move_to_device(x, device, non_blocking) for x in o]  # type: ignore[return-value]
     elif isinstance(o, tuple):
-        return tuple((move_to_device(x, device) for x in o))  # type: ignore[return-value]
+        return tuple((move_to_device(x, device, non_blocking) for x in o))  # type: ignore[return-value]
     else:
         return o
 
 
+def _record_stream(o: Any, stream: torch.cuda.Stream) -> None:
+    if isinstance(o, torch.Tensor):
+        o.record_stream(stream)
+    elif isinstance(o, dict) or isinstance(o, UserDict):
+        for v in o.values():
+            _record_stream(v, stream)
+    elif isinstance(o, (list, tuple)):
+        for x in o:
+            _record_stream(x, stream)
+
+
+def prefetch_to_device(
+    iterable: Iterable[T], device: torch.device, prefetch_factor: int = 2
+) -> Generator[T, None, None]:
+    """
+    Iterates over ``iterable`` while a background thread copies the next ``prefetch_factor`` items
+    to ``device`` on a separate CUDA stream, so that host-to-device copies overlap with the
+    computation on the current stream.
+
+    At most ``prefetch_factor`` items are on the device ahead of the consumer, so together with
+    the item the consumer is working on, up to ``prefetch_factor + 1`` items take up device memory
+    at any time, provided the consumer lets go of each item before asking for the next one.
+
+    If ``device`` is not a CUDA device, this just iterates over ``iterable``.
+    """
+    if device.type != "cuda":
+        yield from iterable
+        return
+
+    copy_stream = torch.cuda.Stream(device)
+    # Entries are (item, event marking the end of its copy, exception raised while producing it).
+    # `None` marks the end of the iterable.
+    entries: "queue.Queue[Optional[Tuple[Any, Any, Optional[BaseException]]]]" = queue.Queue(
+        maxsize=prefetch_factor
+    )
+    # One slot for every item that has been copied to the device but not handed to the consumer yet.
+    slots = threading.Semaphore(prefetch_factor)
+    stop = threading.Event()
+
+    def acquire_slot() -> bool:
+        while not stop.is_set():
+            if slots.acquire(timeout=0.1):
+                return True
+        return False
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                entries.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def copy_items():
+        try:
+            with torch.cuda.stream(copy_stream):
+                for item in iterable:
+                    if not acquire_slot():
+                        return
+                    item = move_to_device(item, device, non_blocking=True)
+                    copied = torch.cuda.Event()
+                    copied.record(copy_stream)
+                    if not put((item, copied, None)):
+                        return
+        except BaseException as e:
+            put((None, None, e))
+        else:
+            put(None)
+
+    thread = threading.Thread(target=copy_items, name="prefetch_to_device", daemon=True)
+    thread.start()
+    try:
+        while True:
+            entry = entries.get()
+            if entry is None:
+                return
+            item, copied, exception = entry
+            del entry
+            if exception is not None:
+                raise exception
+            slots.release()
+            current_stream = torch.cuda.current_stream(device)
+            current_stream.wait_event(copied)
+            # Tell the caching allocator that the current stream uses this memory now.
+            _record_stream(item, current_stream)
+            yield item
+            # Let go of the item, so its memory is freed as soon as the consumer is done with it.
+            del item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def mmap_load(path: PathOrStr, **kwargs) -> Any:
+    """
+    Loads an object saved with ``torch.save()`` from ``path``.
+
+    With PyTorch 2.1 or newer the file is memory-mapped, so tensor storages are paged in from
+    disk on demand instead of being copied into freshly allocated memory up front. With older
+    versions this is equivalent to ``torch.load(path, **kwargs)``.
+
+    .. note::
+        Memory-mapping requires the zipfile serialization format, which ``torch.save()``
+        has used by default since PyTorch 1.6.
+    """
+    if _TORCH_LOAD_SUPPORTS_MMAP:
+        kwargs.setdefault("mmap", True)
+    return torch.load(str(path), **kwargs)
+
+
 def check_dataset(dataset, split: str):
     try:
         len(dataset)
@@ -51,6 +169,23 @@ def check_dataloader(dataloader: DataLoader):
         )
 
 
+def tune_dataloader(dataloader: DataLoader, device: torch.device) -> None:
+    """
+    Adjusts the settings of a ``DataLoader`` that can still be changed after it was constructed
+    so that it feeds ``device`` efficiently, and warns about the ones that can't.
+    """
+    if device.type == "cuda" and not dataloader.pin_memory:
+        # Batches in page-locked memory can be copied to the GPU asynchronously,
+        # without going through an intermediate staging buffer.
+        dataloader.pin_memory = True
+    if dataloader.num_workers > 0 and not dataloader.persistent_workers:
+        warnings.warn(
+            "DataLoader uses worker processes but 'persistent_workers' is not set, "
+            "so the workers will be restarted at the beginning of every epoch.",
+            UserWarning,
+        )
+
+
 def set_seed_all(seed: int):
     random.seed(seed)
     torch.manual_seed(seed)
@@ -1,30 +1,40 @@
 import inspect
 import itertools
 import logging
+import os
 import random
 import re
+import secrets
 import warnings
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from types import MappingProxyType
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     ClassVar,
     Dict,
+    FrozenSet,
     Generic,
     Iterable,
+    List,
+    Mapping,
     Optional,
     Set,
+    Tuple,
     Type,
     TypeVar,
     Union,
     cast,
 )
 
+from tango.common.aliases import EnvVarNames
 from tango.common.det_hash import CustomDetHash, det_hash
 from tango.common.exceptions import ConfigurationError, StepStateError
 from tango.common.from_params import (
@@ -57,8 +67,34 @@ _version_re = re.compile("""^[a-zA-Z0-9]+$""")
 
 T = TypeVar("T")
 
+# Objects of these types can never contain steps, and they make up most of a typical config.
+_LEAF_TYPES = frozenset({str, int, float, bool, type(None)})
 
-_random_for_step_names = random.Random()
+
+def _default_format() -> Format:
+    """
+    Returns the format for steps that don't set their own, with the compression given in the
+    ``TANGO_DEFAULT_COMPRESSION`` environment variable, e.g. "zstd" for faster writes.
+    """
+    env_var = EnvVarNames.DEFAULT_COMPRESSION.value
+    compress = os.environ.get(env_var, "gz")
+    try:
+        return DillFormat(compress)
+    except ConfigurationError as e:
+        raise ConfigurationError(f"Invalid value '{compress}' for {env_var}: {e}") from e
+
+
+_DEFAULT_FORMAT: Format = _default_format()
+
+# Maps (DETERMINISTIC, CACHEABLE) to (cache_results, warn) for steps that don't set cache_results.
+_CACHE_DECISIONS: Dict[Tuple[bool, Optional[bool]], Tuple[bool, bool]] = {
+    (False, None): (False, False),
+    (True, None): (True, False),
+    (False, False): (False, False),
+    (True, False): (False, False),
+    (False, True): (True, True),
+    (True, True): (True, False),
+}
 
 
 @dataclass
@@ -167,9 +203,12 @@ class Step(Registrable, Generic[T]):
     the old results, so when you revert your code, the old cache entries will stick around and be
     picked up."""
 
-    FORMAT: Format = DillFormat("gz")
+    FORMAT: Format = _DEFAULT_FORMAT
     """This specifies the format the results of this step will be serialized in. See the documentation
-    for :class:`~tango.format.Format` for details."""
+    for :class:`~tango.format.Format` for details.
+
+    The default is a :class:`~tango.format.DillFormat` compressed with gzip. You can pick a different
+    compression for it with the ``TANGO_DEFAULT_COMPRESSION`` environment variable."""
 
     SKIP_ID_ARGUMENTS: Set[str] = set()
     """If your :meth:`run()` method takes some arguments that don't affect the results, list them here.
@@ -195,6 +234,14 @@ class Step(Registrable, Generic[T]):
     Used internally for testing.
     """
 
+    _unique_id_hash: Optional[int] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # VERSION is a class attribute, so it only needs to be checked once per class.
+        if cls.VERSION is not None:
+            assert _version_re.match(cls.VERSION), f"Invalid characters in version '{cls.VERSION}'"
+
     def __init__(
         self,
         step_name: Optional[str] = None,
@@ -207,17 +254,7 @@ class Step(Registrable, Generic[T]):
         step_extra_dependencies: Optional[Iterable["Step"]] = None,
         **kwargs,
     ):
-        if self.VERSION is not None:
-            assert _version_re.match(
-                self.VERSION
-            ), f"Invalid characters in version '{self.VERSION}'"
-
-        run_defaults = {
-            k: v.default
-            for k, v in inspect.signature(self.run).parameters.items()
-            if v.default is not inspect.Parameter.empty
-        }
-        self.kwargs = self.massage_kwargs({**run_defaults, **kwargs})
+        self.kwargs = self.massage_kwargs({**_run_defaults(self.__class__), **kwargs})
 
         if step_format is None:
             self.format = self.FORMAT
@@ -249,25 +286,16 @@ class Step(Registrable, Generic[T]):
         elif cache_results is False:
             self.cache_results = False
         elif cache_results is None:
-            c = (self.DETERMINISTIC, self.CACHEABLE)
-            if c == (False, None):
-                self.cache_results = False
-            elif c == (True, None):
-                self.cache_results = True
-            elif c == (False, False):
-                self.cache_results = False
-            elif c == (True, False):
-                self.cache_results = False
-            elif c == (False, True):
+            decision = _CACHE_DECISIONS.get((self.DETERMINISTIC, self.CACHEABLE))
+            assert (
+                decision is not None
+            ), "Step.DETERMINISTIC or step.CACHEABLE are set to an invalid value."
+            self.cache_results, warn = decision
+            if warn:
                 warnings.warn(
                     f"Step {self.name} is set to be cacheable despite not being deterministic.",
                     UserWarning,
                 )
-                self.cache_results = True
-            elif c == (True, True):
-                self.cache_results = True
-            else:
-                assert False, "Step.DETERMINISTIC or step.CACHEABLE are set to an invalid value."
         else:
             raise ConfigurationError(
                 f"Step {self.name}'s cache_results parameter is set to an invalid value."
@@ -394,21 +422,8 @@ class Step(Registrable, Generic[T]):
                 f"Tried to make a Step of type {choice}, but ended up with a {subclass}."
             )
 
-        if issubclass(subclass, FunctionalStep):
-            parameters = infer_method_params(subclass, subclass.WRAPPED_FUNC, infer_kwargs=False)
-            if subclass.BIND:
-                if "self" not in parameters:
-                    raise ConfigurationError(
-                        f"Functional step for {subclass.WRAPPED_FUNC} is bound but is missing argument 'self'"
-                    )
-                else:
-                    del parameters["self"]
-        else:
-            parameters = infer_method_params(subclass, subclass.run, infer_kwargs=False)
-            del parameters["self"]
-        init_parameters = infer_constructor_params(subclass)
-        del init_parameters["self"]
-        del init_parameters["kwargs"]
+        parameters = dict(_run_parameters(subclass))
+        init_parameters = _init_parameters(subclass)
         parameter_overlap = parameters.keys() & init_parameters.keys()
         assert len(parameter_overlap) <= 0, (
             f"If this assert fails it means that you wrote a Step with a run() method that takes one of the "
@@ -474,8 +489,10 @@ class Step(Registrable, Generic[T]):
             self.work_dir_for_run = Path(dir_for_cleanup.name)
 
         try:
-            self._replace_steps_with_results(self.extra_dependencies, workspace)
-            kwargs = self._replace_steps_with_results(self.kwargs, workspace)
+            results = _step_results(
+                (self.extra_dependencies, self.kwargs), workspace, needed_by=self
+            )
+            kwargs = _substitute_step_results(self.kwargs, results, workspace, needed_by=self)
             self.log_starting(needed_by=needed_by)
             workspace.step_starting(self)
 
@@ -585,9 +602,8 @@ class Step(Registrable, Generic[T]):
                     )
                 )[:32]
             else:
-                self.unique_id_cache += det_hash(
-                    _random_for_step_names.getrandbits((58**32).bit_length())
-                )[:32]
+                # We use `secrets` because `random` is re-seeded every time a deterministic step runs.
+                self.unique_id_cache += secrets.token_hex(16)
             if self._UNIQUE_ID_SUFFIX is not None:
                 self.unique_id_cache += f"-{self._UNIQUE_ID_SUFFIX}"
 
@@ -600,41 +616,30 @@ class Step(Registrable, Generic[T]):
         """
         A step's hash is just its unique ID.
         """
-        return hash(self.unique_id)
+        if self._unique_id_hash is None:
+            self._unique_id_hash = hash(self.unique_id)
+        return self._unique_id_hash
 
     def __eq__(self, other):
         """
         Determines whether this step is equal to another step. Two steps with the same unique ID are
         considered identical.
         """
-        if isinstance(other, Step):
+        if self is other:
+            return True
+        elif isinstance(other, Step):
             return self.unique_id == other.unique_id
         else:
             return False
 
-    def _replace_steps_with_results(self, o: Any, workspace: "Workspace"):
-        if isinstance(o, (Step, StepIndexer)):
-            return o.result(workspace=workspace, needed_by=self)
-        elif isinstance(o, Lazy):
-            return Lazy(
-                o._constructor,
-                params=Params(
-                    self._replace_steps_with_results(o._params.as_dict(quiet=True), workspace)
-                ),
-                constructor_extras=self._replace_steps_with_results(
-                    o._constructor_extras, workspace
-                ),
-            )
-        elif isinstance(o, WithUnresolvedSteps):
-            return o.construct(workspace)
-        elif isinstance(o, (list, tuple, set)):
-            return o.__class__(self._replace_steps_with_results(i, workspace) for i in o)
-        elif isinstance(o, dict):
-            return {
-                key: self._replace_steps_with_results(value, workspace) for key, value in o.items()
-            }
-        else:
-            return o
+    def __getstate__(self):
+        # String hashes are salted per process, so the cached hash must not travel with the step.
+        # The cached dependency sets are cheap to rebuild, and can't be unpickled before their
+        # steps are.
+        state = self.__dict__.copy()
+        for key in ("_unique_id_hash", "dependencies", "recursive_dependencies"):
+            state.pop(key, None)
+        return state
 
     def result(
         self, workspace: Optional["Workspace"] = None, needed_by: Optional["Step"] = None
@@ -714,19 +719,23 @@ class Step(Registrable, Generic[T]):
         yield from self.extra_dependencies
         yield from dependencies_internal(self.kwargs.values())
 
-    @property
-    def dependencies(self) -> Set["Step"]:
+    @cached_property
+    def dependencies(self) -> FrozenSet["Step"]:
         """
         Returns a set of steps that this step depends on. This does not return recursive dependencies.
+
+        The set is computed once and shared between callers, so it is immutable.
         """
-        return set(self._ordered_dependencies())
+        return frozenset(self._ordered_dependencies())
 
-    @property
-    def recursive_dependencies(self) -> Set["Step"]:
+    @cached_property
+    def recursive_dependencies(self) -> FrozenSet["Step"]:
         """
         Returns a set of steps that this step depends on. This returns recursive dependencies.
+
+        The set is computed once and shared between callers, so it is immutable.
         """
-        seen = set()
+        seen: Set["Step"] = set()
         steps = list(self.dependencies)
         while len(steps) > 0:
             step = steps.pop()
@@ -734,7 +743,7 @@ class Step(Registrable, Generic[T]):
                 continue
             seen.add(step)
             steps.extend(step.dependencies)
-        return seen
+        return frozenset(seen)
 
     def log_cache_hit(self, needed_by: Optional["Step"] = None) -> None:
         if needed_by is not None:
@@ -782,6 +791,43 @@ class Step(Registrable, Generic[T]):
         cli_logger.error('[red]\N{ballot x} Step [bold]"%s"[/] failed[/]', self.name)
 
 
+# Inspecting signatures is slow, so we only do it once per step class.
+@lru_cache(maxsize=None)
+def _run_defaults(step_class: Type[Step]) -> Mapping[str, Any]:
+    return MappingProxyType(
+        {
+            k: v.default
+            for k, v in inspect.signature(step_class.run).parameters.items()
+            if v.default is not inspect.Parameter.empty
+        }
+    )
+
+
+@lru_cache(maxsize=None)
+def _run_parameters(step_class: Type[Step]) -> Mapping[str, inspect.Parameter]:
+    if issubclass(step_class, FunctionalStep):
+        parameters = infer_method_params(step_class, step_class.WRAPPED_FUNC, infer_kwargs=False)
+        if step_class.BIND:
+            if "self" not in parameters:
+                raise ConfigurationError(
+                    f"Functional step for {step_class.WRAPPED_FUNC} is bound but is missing argument 'self'"
+                )
+            else:
+                del parameters["self"]
+    else:
+        parameters = infer_method_params(step_class, step_class.run, infer_kwargs=False)
+        del parameters["self"]
+    return MappingProxyType(parameters)
+
+
+@lru_cache(maxsize=None)
+def _init_parameters(step_class: Type[Step]) -> Mapping[str, inspect.Parameter]:
+    init_parameters = infer_constructor_params(step_class)
+    del init_parameters["self"]
+    del init_parameters["kwargs"]
+    return MappingProxyType(init_parameters)
+
+
 class FunctionalStep(Step):
     WRAPPED_FUNC: ClassVar[Callable]
     BIND: ClassVar[bool] = False
@@ -805,7 +851,7 @@ def step(
     deterministic: bool = True,
     cacheable: Optional[bool] = None,
     version: Optional[str] = None,
-    format: Format = DillFormat("gz"),
+    format: Format = _DEFAULT_FORMAT,
     skip_id_arguments: Optional[Set[str]] = None,
     metadata: Optional[Dict[str, Any]] = None,
 ):
@@ -964,24 +1010,9 @@ class WithUnresolvedSteps(CustomDetHash):
         :return: A new object that's a copy of the original object, with all instances of :class:`.Step` replaced
                  with the results of the step.
         """
-        if isinstance(o, (Step, StepIndexer)):
-            return o.result(workspace=workspace)
-        elif isinstance(o, Lazy):
-            return Lazy(
-                o._constructor,
-                params=Params(cls.with_resolved_steps(o._params.as_dict(quiet=True), workspace)),
-                constructor_extras=cls.with_resolved_steps(o._constructor_extras, workspace),
-            )
-        elif isinstance(o, cls):
-            return o.construct(workspace)
-        elif isinstance(o, (dict, Params)):
-            return o.__class__(
-                {key: cls.with_resolved_steps(value, workspace) for key, value in o.items()}
-            )
-        elif isinstance(o, (list, tuple, set)):
-            return o.__class__(cls.with_resolved_steps(item, workspace) for item in o)
-        else:
-            return o
+        return _substitute_step_results(
+            o, _step_results(o, workspace), workspace, keep_mapping_types=True
+        )
 
     def construct(self, workspace: "Workspace"):
         """
@@ -990,9 +1021,146 @@ class WithUnresolvedSteps(CustomDetHash):
         :param workspace: The :class:`.Workspace` in which to resolve all the steps.
         :return: The result of calling the function.
         """
-        resolved_args = self.with_resolved_steps(self.args, workspace)
-        resolved_kwargs = self.with_resolved_steps(self.kwargs, workspace)
+        resolved_args, resolved_kwargs = self.with_resolved_steps(
+            (self.args, self.kwargs), workspace
+        )
         return self.function(*resolved_args, **resolved_kwargs)
 
     def det_hash_object(self) -> Any:
         return self.function.__qualname__, self.args, self.kwargs
+
+
+def _step_results(
+    o: Any, workspace: "Workspace", needed_by: Optional[Step] = None
+) -> Dict[Step, Any]:
+    """
+    Finds all the steps in a Python object and returns a dictionary mapping each of them to its result.
+
+    Every step is resolved exactly once, even if it appears in the object many times. Results that are
+    already in the step cache are read in parallel if the cache supports it
+    (see :attr:`~tango.step_cache.StepCache.CONCURRENT_READS`), all other steps are run in the order in
+    which they appear in the object.
+    """
+    steps: Dict[Step, None] = {}  # We use a dict as an ordered set.
+    todo = [o]
+    while len(todo) > 0:
+        o = todo.pop()
+        if type(o) in _LEAF_TYPES:
+            continue
+        elif isinstance(o, (Step, StepIndexer)):
+            steps[o if isinstance(o, Step) else o.step] = None
+        elif isinstance(o, Lazy):
+            todo.append(o._constructor_extras)
+            todo.append(o._params.as_dict(quiet=True))
+        elif isinstance(o, WithUnresolvedSteps):
+            todo.append(o.kwargs)
+            todo.append(o.args)
+        elif isinstance(o, (list, tuple, set)):
+            todo.extend(reversed(list(o)))
+        elif isinstance(o, (dict, Params)):
+            todo.extend(reversed(list(o.values())))
+
+    results: Dict[Step, Any] = {}
+    if len(steps) > 1 and workspace.step_cache.CONCURRENT_READS:
+        # Reading results from the cache is mostly I/O, so we can overlap the reads.
+        cached_steps = [
+            step for step in steps if step.cache_results and step in workspace.step_cache
+        ]
+        if len(cached_steps) > 1:
+            max_workers = min(len(cached_steps), 8, os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = {
+                    step: pool.submit(workspace.step_cache.__getitem__, step)
+                    for step in cached_steps
+                }
+                for step, future in futures.items():
+                    step.log_cache_hit(needed_by=needed_by)
+                    results[step] = future.result()
+
+    for step in steps:
+        if step not in results:
+            results[step] = step.result(workspace=workspace, needed_by=needed_by)
+    return results
+
+
+def _substitute_step_results(
+    o: Any,
+    results: Dict[Step, Any],
+    workspace: "Workspace",
+    needed_by: Optional[Step] = None,
+    keep_mapping_types: bool = False,
+) -> Any:
+    """
+    Returns a copy of a Python object with all steps replaced by their results, as computed by
+    :func:`_step_results()`.
+
+    Results that are iterators are used only once, because reading from an iterator consumes it. Every
+    further occurrence of the same step gets a new result from the step.
+
+    Dictionaries are rebuilt as plain ``dict`` objects, except inside :class:`WithUnresolvedSteps`
+    or when ``keep_mapping_types`` is set, where they keep their class.
+    """
+
+    def children(o: Any) -> Optional[List[Any]]:
+        if isinstance(o, Lazy):
+            return [o._params.as_dict(quiet=True), o._constructor_extras]
+        elif isinstance(o, WithUnresolvedSteps):
+            return [o.args, o.kwargs]
+        elif isinstance(o, (list, tuple, set)):
+            return list(o)
+        elif isinstance(o, (dict, Params)):
+            return list(o.values())
+        else:
+            return None
+
+    def rebuild(o: Any, substituted: List[Any], keep: bool) -> Any:
+        if isinstance(o, Lazy):
+            params, constructor_extras = substituted
+            return Lazy(
+                o._constructor, params=Params(params), constructor_extras=constructor_extras
+            )
+        elif isinstance(o, WithUnresolvedSteps):
+            args, kwargs = substituted
+            return o.function(*args, **kwargs)
+        elif isinstance(o, (list, tuple, set)):
+            return o.__class__(substituted)
+        elif isinstance(o, Params):
+            return Params(dict(zip(o.keys(), substituted)))
+        else:
+            rebuilt = dict(zip(o.keys(), substituted))
+            return o.__class__(rebuilt) if keep else rebuilt
+
+    def take_result(step: Step) -> Any:
+        if step not in results:
+            return step.result(workspace=workspace, needed_by=needed_by)
+        result = results[step]
+        if hasattr(result, "__next__"):
+            del results[step]
+        return result
+
+    # We walk the object with an explicit stack instead of recursing, so deeply nested objects
+    # don't hit the recursion limit. Containers are rebuilt after all their children, and the
+    # finished children wait on the `done` stack until then.
+    todo: List[Tuple[Any, bool, Optional[int]]] = [(o, keep_mapping_types, None)]
+    done: List[Any] = []
+    while len(todo) > 0:
+        o, keep, num_children = todo.pop()
+        if num_children is not None:
+            substituted = done[len(done) - num_children :]
+            del done[len(done) - num_children :]
+            done.append(rebuild(o, substituted, keep))
+        elif type(o) in _LEAF_TYPES:
+            done.append(o)
+        elif isinstance(o, Step):
+            done.append(take_result(o))
+        elif isinstance(o, StepIndexer):
+            done.append(take_result(o.step)[o.key])
+        else:
+            items = children(o)
+            if items is None:
+                done.append(o)
+            else:
+                todo.append((o, keep, len(items)))
+                keep = keep or isinstance(o, WithUnresolvedSteps)
+                todo.extend((item, keep, None) for item in reversed(items))
+    return done[0]
@@ -27,6 +27,12 @@ class StepCache(Registrable):
     The default implementation is :class:`.MemoryStepCache`.
     """
 
+    CONCURRENT_READS: bool = False
+    """
+    Set this to ``True`` if results can safely be read from this cache from several threads
+    at the same time. Steps that depend on several cached results will then read them in parallel.
+    """
+
     def __contains__(self, step: Any) -> bool:
         """This is a generic implementation of ``__contains__``. If you are writing your own
         ``StepCache``, you might want to write a faster one yourself."""
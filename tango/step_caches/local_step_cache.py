@@ -2,6 +2,7 @@ import collections
 import logging
 import os
 import shutil
+import threading
 import warnings
 import weakref
 from pathlib import Path
@@ -36,6 +37,7 @@ class LocalStepCache(StepCache):
 
     LRU_CACHE_MAX_SIZE = 8
     METADATA_FILE_NAME = "cache-metadata.json"
+    CONCURRENT_READS = True
 
     def __init__(self, dir: PathOrStr):
         self.dir = Path(dir)
@@ -52,6 +54,8 @@ class LocalStepCache(StepCache):
     def _init_mem_caches(self):
         self.weak_cache = weakref.WeakValueDictionary()
         self.strong_cache = collections.OrderedDict()
+        # Steps may read several results from the cache at the same time in different threads.
+        self._mem_cache_lock = threading.Lock()
 
     def __getstate__(self):
         """
@@ -71,36 +75,40 @@ class LocalStepCache(StepCache):
             # We never cache iterators, because they are mutable, storing their current position.
             return
 
-        self.strong_cache[key] = o
-        self.strong_cache.move_to_end(key)
-        while len(self.strong_cache) > self.LRU_CACHE_MAX_SIZE:
-            del self.strong_cache[next(iter(self.strong_cache))]
+        with self._mem_cache_lock:
+            self.strong_cache[key] = o
+            self.strong_cache.move_to_end(key)
+            while len(self.strong_cache) > self.LRU_CACHE_MAX_SIZE:
+                del self.strong_cache[next(iter(self.strong_cache))]
 
-        try:
-            self.weak_cache[key] = o
-        except TypeError:
-            pass  # Many native Python objects cannot be referenced weakly, and they throw TypeError when you try
+            try:
+                self.weak_cache[key] = o
+            except TypeError:
+                # Many native Python objects cannot be referenced weakly, and they throw TypeError when you try
+                pass
 
     def _get_from_cache(self, key: str) -> Optional[Any]:
-        result = self.strong_cache.get(key)
-        if result is not None:
-            self.strong_cache.move_to_end(key)
-            return result
-        try:
-            return self.weak_cache[key]
-        except KeyError:
-            return None
+        with self._mem_cache_lock:
+            result = self.strong_cache.get(key)
+            if result is not None:
+                self.strong_cache.move_to_end(key)
+                return result
+            try:
+                return self.weak_cache[key]
+            except KeyError:
+                return None
 
     def _remove_from_cache(self, key: str) -> None:
-        # check and remove from strong cache
-        if key in self.strong_cache:
-            del self.strong_cache[key]
-            assert key not in self.strong_cache
+        with self._mem_cache_lock:
+            # check and remove from strong cache
+            if key in self.strong_cache:
+                del self.strong_cache[key]
+                assert key not in self.strong_cache
 
-        # check and remove from weak cache
-        if key in self.weak_cache:
-            del self.weak_cache[key]
-            assert key not in self.weak_cache
+            # check and remove from weak cache
+            if key in self.weak_cache:
+                del self.weak_cache[key]
+                assert key not in self.weak_cache
 
     def _metadata_path(self, step_or_unique_id: Union[Step, StepInfo, str]) -> Path:
         return self.step_dir(step_or_unique_id) / self.METADATA_FILE_NAME
@@ -110,10 +118,9 @@ class LocalStepCache(StepCache):
             isinstance(step, StepInfo) and step.cacheable
         ):
             key = step.unique_id
-            if key in self.strong_cache:
-                return True
-            if key in self.weak_cache:
-                return True
+            with self._mem_cache_lock:
+                if key in self.strong_cache or key in self.weak_cache:
+                    return True
             return self._metadata_path(
                 cast(Union[Step, StepInfo], step)  # cast is for mypy :/
             ).exists()
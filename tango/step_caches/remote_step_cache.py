@@ -41,6 +41,9 @@ class RemoteStepCache(LocalStepCache):
 
     Constants = RemoteConstants
 
+    # The remote clients aren't known to be thread-safe.
+    CONCURRENT_READS = False
+
     def __init__(self, local_dir: Path):
         super().__init__(local_dir)
 
@@ -1,4 +1,6 @@
+import heapq
 import logging
+from collections import defaultdict
 from typing import Any, Dict, Iterator, List, Mapping, Set, Type, Union
 
 from tango.common import PathOrStr
@@ -64,27 +66,34 @@ class StepGraph(Mapping[str, Step]):
 
     @classmethod
     def _get_ordered_steps(cls, dependencies: Dict[str, Set[str]]) -> List[str]:
-        done: Set[str] = set()
-        todo = list(dependencies.keys())
+        # This is Kahn's algorithm. Out of all the steps that are ready to go, we always pick
+        # the one that comes first in `dependencies`, so the order stays close to the original.
+        step_names = list(dependencies.keys())
+        positions = {step_name: i for i, step_name in enumerate(step_names)}
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        missing_dependencies: Dict[str, int] = {}
+        for step_name, step_deps in dependencies.items():
+            missing_dependencies[step_name] = len(step_deps)
+            for dep in step_deps:
+                dependents[dep].append(step_name)
+
+        ready = [positions[step_name] for step_name in step_names if not dependencies[step_name]]
+        heapq.heapify(ready)
         ordered_steps = list()
-        while len(todo) > 0:
-            new_todo = []
-            for step_name in todo:
-                if len(dependencies[step_name] & done) == len(dependencies[step_name]):
-                    done.add(step_name)
-                    ordered_steps.append(step_name)
-                else:
-                    new_todo.append(step_name)
-            if len(todo) == len(new_todo):
-                raise ConfigurationError(
-                    "Could not make progress parsing the steps. "
-                    "You probably have a circular reference between the steps, "
-                    "Or a missing dependency."
-                )
-            todo = new_todo
-        del dependencies
-        del done
-        del todo
+        while len(ready) > 0:
+            step_name = step_names[heapq.heappop(ready)]
+            ordered_steps.append(step_name)
+            for dependent in dependents[step_name]:
+                missing_dependencies[dependent] -= 1
+                if missing_dependencies[dependent] == 0:
+                    heapq.heappush(ready, positions[dependent])
+
+        if len(ordered_steps) < len(step_names):
+            raise ConfigurationError(
+                "Could not make progress parsing the steps. "
+                "You probably have a circular reference between the steps, "
+                "Or a missing dependency."
+            )
         return ordered_steps
 
     def _sanity_check(self) -> None:
@@ -103,9 +112,6 @@ class StepGraph(Mapping[str, Step]):
     @classmethod
     def from_params(cls: Type["StepGraph"], params: Dict[str, Params]) -> "StepGraph":  # type: ignore[override]
         # Determine the order in which to create steps so that all dependent steps are available when we need them.
-        # This algorithm for resolving step dependencies is O(n^2). Since we're
-        # anticipating the number of steps in a single config to be in the dozens at most (#famouslastwords),
-        # we choose simplicity over cleverness.
         dependencies = {
             step_name: cls._find_step_dependencies(step_params)
             for step_name, step_params in params.items()
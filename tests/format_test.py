@@ -1,9 +1,12 @@
-from typing import Dict, Iterable, Optional
+import sys
+from typing import Dict, Iterable, Optional, Type
+from unittest.mock import patch
 
 import pytest
 
+from tango.common.exceptions import ConfigurationError
 from tango.common.testing import TangoTestCase
-from tango.format import _OPEN_FUNCTIONS, DillFormat, JsonFormat, TextFormat
+from tango.format import _OPEN_FUNCTIONS, DillFormat, Format, JsonFormat, TextFormat
 
 
 class TestFormat(TangoTestCase):
@@ -41,6 +44,12 @@ class TestFormat(TangoTestCase):
         assert [x + 1 for x in range(10)] == list(r2)
         assert "compress" in format.to_params()
 
+    @pytest.mark.parametrize("format_class", [DillFormat, JsonFormat, TextFormat])
+    def test_zstd_without_zstandard(self, format_class: Type[Format]):
+        with patch.dict(sys.modules, {"zstandard": None}):
+            with pytest.raises(ConfigurationError, match="zstandard"):
+                format_class("zstd")  # type: ignore[call-arg]
+
     def test_iterable_text_format(self):
         numbers = ["ichi", "ni", "san"]
         l1 = iter(numbers)
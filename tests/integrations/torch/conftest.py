@@ -0,0 +1,68 @@
+import contextlib
+import weakref
+from typing import Any, List
+
+import pytest
+import torch
+
+from tango.integrations.torch import util
+
+
+class FakeCuda:
+    """
+    Keeps track of the items that :func:`~tango.integrations.torch.util.prefetch_to_device`
+    copied to the fake CUDA device.
+    """
+
+    def __init__(self):
+        self.copies: List[weakref.ref] = []
+
+    def copy(self, o: Any) -> Any:
+        if isinstance(o, torch.Tensor):
+            copy = o.clone()
+            self.copies.append(weakref.ref(copy))
+            return copy
+        elif isinstance(o, dict):
+            return {k: self.copy(v) for k, v in o.items()}
+        elif isinstance(o, (list, tuple)):
+            return type(o)(self.copy(x) for x in o)
+        else:
+            return o
+
+    @property
+    def tensors_on_device(self) -> int:
+        return sum(copy() is not None for copy in self.copies)
+
+
+class _FakeStream:
+    def wait_event(self, event):
+        pass
+
+
+class _FakeEvent:
+    def record(self, stream=None):
+        pass
+
+
+@pytest.fixture
+def fake_cuda(monkeypatch) -> FakeCuda:
+    """
+    Stands in for the CUDA stream API, so that ``prefetch_to_device()`` can run its CUDA code path
+    without a GPU. Copying to the device clones the tensors on the CPU instead.
+    """
+    fake = FakeCuda()
+    move_to_device = util.move_to_device
+
+    def fake_move_to_device(o, device, non_blocking=False):
+        if device.type == "cuda":
+            return fake.copy(o)
+        else:
+            return move_to_device(o, device, non_blocking)
+
+    monkeypatch.setattr(torch.cuda, "Stream", lambda device=None: _FakeStream())
+    monkeypatch.setattr(torch.cuda, "stream", lambda stream: contextlib.nullcontext())
+    monkeypatch.setattr(torch.cuda, "Event", _FakeEvent)
+    monkeypatch.setattr(torch.cuda, "current_stream", lambda device=None: _FakeStream())
+    monkeypatch.setattr(util, "_record_stream", lambda o, stream: None)
+    monkeypatch.setattr(util, "move_to_device", fake_move_to_device)
+    return fake
@@ -1,10 +1,37 @@
 import json
+import threading
+import time
 
 import pytest
+import torch
 import torch.distributed as dist
 
+from tango.common.dataset_dict import DatasetDict
+from tango.common.exceptions import CliRunError, ConfigurationError
 from tango.common.logging import initialize_logging, teardown_logging
 from tango.common.testing import TangoTestCase
+from tango.integrations.torch import DataLoader, TorchTrainStep, TrainCallback, util
+from tango.integrations.torch.train import _cycle_through_epochs
+
+
+@TrainCallback.register("test_fail_once")
+class FailOnceCallback(TrainCallback):
+    failed = False
+
+    def post_batch(self, step, epoch, batch_loss, batch_outputs):
+        if step == 14 and not FailOnceCallback.failed:
+            FailOnceCallback.failed = True
+            raise RuntimeError("Failing once")
+
+
+def _prefetch_through_cuda(monkeypatch):
+    # Train on the CPU, but send the batches through the CUDA code path of the prefetcher.
+    monkeypatch.setattr(
+        "tango.integrations.torch.train.prefetch_to_device",
+        lambda iterable, device, **kwargs: util.prefetch_to_device(
+            iterable, torch.device("cuda"), **kwargs
+        ),
+    )
 
 
 class TestTrainStep(TangoTestCase):
@@ -81,6 +108,66 @@ class TestTrainStep(TangoTestCase):
         )
         assert (result_dir / "train" / "data.pt").is_file()
 
+    def test_basic_train_with_prefetching(self, monkeypatch, fake_cuda):
+        _prefetch_through_cuda(monkeypatch)
+        result_dir = self.run(
+            self.FIXTURES_ROOT / "integrations" / "torch" / "train.jsonnet",
+            include_package=[
+                "test_fixtures.integrations.common",
+                "test_fixtures.integrations.torch",
+            ],
+            overrides=json.dumps({"steps.train.grad_accum": 2}),
+        )
+        assert (result_dir / "train" / "data.pt").is_file()
+        assert fake_cuda.copies
+
+    def test_resume_train_with_prefetching(self, monkeypatch, fake_cuda):
+        _prefetch_through_cuda(monkeypatch)
+        monkeypatch.setattr(FailOnceCallback, "failed", False)
+        overrides = {
+            "steps.train.train_steps": 20,
+            "steps.train.validation_split": None,
+            "steps.train.validate_every": None,
+            "steps.train.callbacks": [{"type": "test_fail_once"}],
+        }
+        with pytest.raises(CliRunError):
+            self.run(
+                self.FIXTURES_ROOT / "integrations" / "torch" / "train.jsonnet",
+                include_package=[
+                    "test_fixtures.integrations.common",
+                    "test_fixtures.integrations.torch",
+                ],
+                overrides=overrides,
+            )
+
+        # The second run picks up from the checkpoint at step 10.
+        fake_cuda.copies.clear()
+        result_dir = self.run(
+            self.FIXTURES_ROOT / "integrations" / "torch" / "train.jsonnet",
+            include_package=[
+                "test_fixtures.integrations.common",
+                "test_fixtures.integrations.torch",
+            ],
+            overrides=overrides,
+        )
+        assert (result_dir / "train" / "work" / "checkpoint_state_step20").is_dir()
+        # Each batch has two tensors. The batches of the first ten steps are skipped without
+        # copying them, so only the last ten steps and at most two prefetched batches went to
+        # the device.
+        assert 2 * 10 <= len(fake_cuda.copies) <= 2 * 12
+
+    def test_train_with_missing_split(self):
+        step = TorchTrainStep(step_name="train")
+        with pytest.raises(ConfigurationError, match="no 'dev' split"):
+            step.run(
+                model=None,  # type: ignore[arg-type]
+                training_engine=None,  # type: ignore[arg-type]
+                dataset_dict=DatasetDict({"train": [], "validation": []}),
+                train_dataloader=None,  # type: ignore[arg-type]
+                validation_split="dev",
+                train_steps=1,
+            )
+
     def test_train_distributed(self):
         result_dir = self.run(
             self.FIXTURES_ROOT / "integrations" / "torch" / "train_dist.jsonnet",
@@ -131,3 +218,37 @@ class TestTrainStep(TangoTestCase):
         last_step = result_dir / "train" / "work" / f"checkpoint_state_step{expected_steps}"
         assert last_step.is_dir()
         assert latest.samefile(last_step)
+
+
+def test_cycle_through_epochs_prefetches_micro_batches(fake_cuda):
+    dataloader = DataLoader([{"x": torch.tensor(i)} for i in range(8)], batch_size=1)
+    epoch_batches = _cycle_through_epochs(dataloader, False, 4, torch.device("cuda"))
+    for expected_epoch, expected_batch in [(0, [0, 1, 2, 3]), (0, [4, 5, 6, 7]), (1, [0, 1, 2, 3])]:
+        epoch, batch, micro_batches = next(epoch_batches)
+        assert epoch == expected_epoch
+        assert [micro_batch["x"].item() for micro_batch in batch] == expected_batch
+        for micro_batch, expected in zip(micro_batches, expected_batch):
+            assert micro_batch["x"].item() == expected
+            # Give the producer time to run as far ahead as it's allowed to.
+            time.sleep(0.05)
+            # The default prefetch factor is 2, so there's at most one micro-batch the
+            # training loop is working on, and two more.
+            assert fake_cuda.tensors_on_device <= 3
+            del micro_batch
+    epoch_batches.close()
+    assert not [thread for thread in threading.enumerate() if thread.name == "prefetch_to_device"]
+
+
+def test_cycle_through_epochs_skips_steps_without_copying(fake_cuda):
+    dataloader = DataLoader([{"x": torch.tensor(i)} for i in range(8)], batch_size=1)
+    epoch_batches = _cycle_through_epochs(dataloader, False, 2, torch.device("cuda"), skip_steps=3)
+    for expected_batch in [[0, 1], [2, 3], [4, 5]]:
+        epoch, batch, micro_batches = next(epoch_batches)
+        assert [micro_batch["x"].item() for micro_batch in batch] == expected_batch
+        assert not list(micro_batches)
+    assert not fake_cuda.copies
+
+    epoch, batch, micro_batches = next(epoch_batches)
+    assert [micro_batch["x"].item() for micro_batch in micro_batches] == [6, 7]
+    assert len(fake_cuda.copies) == 2
+    epoch_batches.close()
@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+import torch
+
+from tango.integrations.torch.data import DataLoader
+from tango.integrations.torch.util import prefetch_to_device, tune_dataloader
+
+requires_cuda = pytest.mark.skipif(torch.cuda.device_count() < 1, reason="Requires CUDA devices")
+
+
+def _prefetch_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "prefetch_to_device"]
+
+
+def test_tune_dataloader_pins_memory_for_cuda():
+    dataloader = DataLoader(list(range(10)), batch_size=2)
+    tune_dataloader(dataloader, torch.device("cpu"))
+    assert not dataloader.pin_memory
+    tune_dataloader(dataloader, torch.device("cuda"))
+    assert dataloader.pin_memory
+
+
+def test_tune_dataloader_warns_about_non_persistent_workers():
+    dataloader = DataLoader(list(range(10)), batch_size=2, num_workers=2)
+    with pytest.warns(UserWarning, match="persistent_workers"):
+        tune_dataloader(dataloader, torch.device("cpu"))
+
+
+def test_prefetch_to_device_on_cpu():
+    batches = [{"x": torch.tensor([i])} for i in range(3)]
+    assert list(prefetch_to_device(batches, torch.device("cpu"))) == batches
+
+
+@requires_cuda
+def test_prefetch_to_device_on_cuda():
+    device = torch.device("cuda", 0)
+    batches = [{"x": torch.tensor([i])} for i in range(5)]
+    prefetched = list(prefetch_to_device(batches, device))
+    assert [batch["x"].item() for batch in prefetched] == list(range(5))
+    assert all(batch["x"].device == device for batch in prefetched)
+    assert not _prefetch_threads()
+
+
+@requires_cuda
+def test_prefetch_to_device_raises_producer_exceptions():
+    def batches():
+        yield torch.tensor([0])
+        raise ValueError("broken batch")
+
+    prefetched = prefetch_to_device(batches(), torch.device("cuda", 0))
+    assert next(prefetched).item() == 0
+    with pytest.raises(ValueError, match="broken batch"):
+        next(prefetched)
+    assert not _prefetch_threads()
+
+
+@requires_cuda
+def test_prefetch_to_device_close_joins_thread():
+    batches = (torch.tensor([i]) for i in range(100))
+    prefetched = prefetch_to_device(batches, torch.device("cuda", 0), prefetch_factor=1)
+    assert next(prefetched).item() == 0
+    assert len(_prefetch_threads()) == 1
+    prefetched.close()
+    assert not _prefetch_threads()
+
+
+def test_prefetch_to_device_limits_items_on_device(fake_cuda):
+    prefetch_factor = 2
+    batches = (torch.tensor([i]) for i in range(10))
+    prefetched = prefetch_to_device(batches, torch.device("cuda"), prefetch_factor=prefetch_factor)
+    most_on_device = 0
+    for i in range(10):
+        batch = next(prefetched)
+        assert batch.item() == i
+        # Give the producer time to run as far ahead as it's allowed to.
+        time.sleep(0.05)
+        most_on_device = max(most_on_device, fake_cuda.tensors_on_device)
+        del batch
+    assert most_on_device == prefetch_factor + 1
+    prefetched.close()
+    assert not _prefetch_threads()
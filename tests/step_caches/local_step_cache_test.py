@@ -1,9 +1,11 @@
 import pickle
 import sys
+from unittest.mock import patch
 
 import pytest
 
 from tango.common.testing import TangoTestCase
+from tango.format import DillFormat
 from tango.step import Step
 from tango.step_caches.local_step_cache import LocalStepCache
 
@@ -37,3 +39,13 @@ class TestLocalStepCache(TangoTestCase):
         unpickled_step_cache = pickle.loads(pickled_step_cache)
         assert step.unique_id not in unpickled_step_cache.strong_cache
         assert step in unpickled_step_cache
+
+    def test_result_is_deserialized_once(self):
+        step = DummyStep(step_name="dummy", x=1)
+        LocalStepCache(self.TEST_DIR)[step] = 1
+
+        step_cache = LocalStepCache(self.TEST_DIR)
+        with patch.object(DillFormat, "read", autospec=True, side_effect=DillFormat.read) as read:
+            for _ in range(3):
+                assert step_cache[step] == 1
+        assert read.call_count == 1
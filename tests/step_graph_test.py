@@ -67,6 +67,23 @@ class TestStepGraph(TangoTestCase):
         with pytest.raises(ConfigurationError, match="Or a missing dependency"):
             StepGraph({"stepB": step_b})
 
+    def test_circular_dependency(self):
+        with pytest.raises(ConfigurationError, match="circular reference"):
+            StepGraph.from_params(
+                {
+                    "stepA": {
+                        "type": "add_numbers",
+                        "a_number": {"type": "ref", "ref": "stepB"},
+                        "b_number": 1,
+                    },
+                    "stepB": {
+                        "type": "add_numbers",
+                        "a_number": {"type": "ref", "ref": "stepA"},
+                        "b_number": 1,
+                    },
+                }
+            )
+
     def test_to_file(self):
         step_graph = StepGraph.from_file(self.FIXTURES_ROOT / "experiment" / "hello_world.jsonnet")
 
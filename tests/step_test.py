@@ -1,5 +1,10 @@
 import collections
-from typing import Any, Dict, Mapping, MutableMapping
+import os
+import pickle
+import sys
+import threading
+from typing import Any, Dict, Iterator, List, Mapping, MutableMapping
+from unittest.mock import patch
 
 import pytest
 
@@ -8,8 +13,9 @@ from tango.common import Params, Registrable
 from tango.common.exceptions import ConfigurationError
 from tango.common.from_params import FromParams
 from tango.common.testing import TangoTestCase
-from tango.step import FunctionalStep, Step, step
-from tango.workspaces import MemoryWorkspace
+from tango.step import FunctionalStep, Step, WithUnresolvedSteps, _default_format, step
+from tango.step_caches import LocalStepCache
+from tango.workspaces import LocalWorkspace, MemoryWorkspace
 
 
 class TestStep(TangoTestCase):
@@ -154,6 +160,162 @@ class TestStep(TangoTestCase):
         sg = StepGraph.from_params(config)
         assert len(sg["holder_consumer"].dependencies) > 0
 
+    def test_invalid_version(self):
+        with pytest.raises(AssertionError, match="Invalid characters in version"):
+
+            class BadVersionStep(Step):
+                VERSION = "1.0"
+
+                def run(self) -> int:  # type: ignore[override]
+                    return 1
+
+        with pytest.raises(AssertionError, match="Invalid characters in version"):
+
+            @step(version="1.0")
+            def bad_version() -> int:
+                return 1
+
+    def test_default_compression(self):
+        with patch.dict(os.environ):
+            os.environ.pop("TANGO_DEFAULT_COMPRESSION", None)
+            assert _default_format().compress == "gz"  # type: ignore[attr-defined]
+
+        with patch.dict(os.environ, {"TANGO_DEFAULT_COMPRESSION": "zstd"}):
+            assert _default_format().compress == "zstd"  # type: ignore[attr-defined]
+
+        with patch.dict(os.environ, {"TANGO_DEFAULT_COMPRESSION": "foo"}):
+            with pytest.raises(ConfigurationError, match="TANGO_DEFAULT_COMPRESSION"):
+                _default_format()
+
+    def test_hash_and_eq(self):
+        step1 = Step.from_params({"type": "float", "result": 3})
+        step2 = Step.from_params({"type": "float", "result": 3})
+        step3 = Step.from_params({"type": "float", "result": 4})
+        assert step1 == step1
+        assert step1 == step2
+        assert step1 != step3
+        assert hash(step1) == hash(step2) == hash(step1.unique_id)
+        assert len({step1, step2, step3}) == 2
+
+        # The cached hash is process-specific, so it must not be pickled.
+        unpickled = pickle.loads(pickle.dumps(step1))
+        assert "_unique_id_hash" not in unpickled.__dict__
+        assert unpickled == step1
+
+    def test_dependencies_are_immutable(self):
+        class AddOneStep(Step[int]):
+            def run(self, x: int) -> int:  # type: ignore
+                return x + 1
+
+        step1 = AddOneStep(x=1)
+        step2 = AddOneStep(x=step1)
+        step3 = AddOneStep(x=step2)
+        assert step3.dependencies == {step2}
+        assert step3.recursive_dependencies == {step1, step2}
+        with pytest.raises(AttributeError):
+            step3.dependencies.add(step1)  # type: ignore[attr-defined]
+        with pytest.raises(AttributeError):
+            step3.recursive_dependencies.discard(step1)  # type: ignore[attr-defined]
+
+    def test_shared_dependency_resolved_once(self):
+        class CountingStep(Step[int]):
+            CACHEABLE = False
+            runs = 0
+
+            def run(self) -> int:  # type: ignore
+                CountingStep.runs += 1
+                return 1
+
+        class SumStep(Step[int]):
+            CACHEABLE = False
+
+            def run(self, numbers: Dict[str, Any]) -> int:  # type: ignore
+                return numbers["a"] + sum(numbers["b"])
+
+        counting = CountingStep()
+        sum_step = SumStep(numbers={"a": counting, "b": [counting, counting]})
+        assert sum_step.result(MemoryWorkspace()) == 3
+        assert CountingStep.runs == 1
+
+    @pytest.mark.parametrize("cacheable", [True, False])
+    def test_iterator_dependency_used_twice(self, cacheable: bool):
+        class GenStep(Step[Iterator[int]]):
+            CACHEABLE = cacheable
+
+            def run(self) -> Iterator[int]:  # type: ignore
+                yield from [1, 2, 3]
+
+        class ConsumerStep(Step[List[List[int]]]):
+            CACHEABLE = False
+
+            def run(self, a: Iterator[int], b: Iterator[int]) -> List[List[int]]:  # type: ignore
+                return [list(a), list(b)]
+
+        workspace = LocalWorkspace(self.TEST_DIR)
+        gen = GenStep()
+        assert ConsumerStep(a=gen, b=gen).result(workspace) == [[1, 2, 3], [1, 2, 3]]
+
+        # With a second cached dependency, the cached results are read in parallel.
+        other = Step.from_params({"type": "float", "result": 1.0})
+        other.ensure_result(workspace)
+        consumer = ConsumerStep(a=gen, b=WithUnresolvedSteps(lambda x, g: g, other, gen))
+        assert consumer.result(workspace) == [[1, 2, 3], [1, 2, 3]]
+
+    @pytest.mark.parametrize("concurrent_reads", [True, False])
+    def test_cached_dependencies_read_in_parallel(self, concurrent_reads: bool):
+        workspace = LocalWorkspace(self.TEST_DIR)
+        step1 = Step.from_params({"type": "float", "result": 1.0})
+        step2 = Step.from_params({"type": "float", "result": 2.0})
+        step1.ensure_result(workspace)
+        step2.ensure_result(workspace)
+
+        class SumFloatsStep(Step[float]):
+            CACHEABLE = False
+
+            def run(self, floats: List[float]) -> float:  # type: ignore
+                return sum(floats)
+
+        read_threads = []
+        getitem = LocalStepCache.__getitem__
+
+        def recording_getitem(cache, step):
+            read_threads.append(threading.current_thread())
+            return getitem(cache, step)
+
+        sum_step = SumFloatsStep(floats=[step1, step2, step1])
+        with patch.object(LocalStepCache, "__getitem__", recording_getitem), patch.object(
+            LocalStepCache, "CONCURRENT_READS", concurrent_reads
+        ):
+            assert sum_step.result(workspace) == 4.0
+
+        assert len(read_threads) == 2
+        if concurrent_reads:
+            assert threading.current_thread() not in read_threads
+        else:
+            assert read_threads == [threading.current_thread()] * 2
+
+    def test_with_resolved_steps_keeps_mapping_types(self):
+        workspace = LocalWorkspace(self.TEST_DIR)
+        float_step = Step.from_params({"type": "float", "result": 1.0})
+        resolved = WithUnresolvedSteps.with_resolved_steps(
+            collections.OrderedDict(a=float_step), workspace
+        )
+        assert type(resolved) is collections.OrderedDict
+        assert resolved == {"a": 1.0}
+
+    def test_with_resolved_steps_deeply_nested(self):
+        workspace = LocalWorkspace(self.TEST_DIR)
+        depth = sys.getrecursionlimit() * 2
+        nested: Any = Step.from_params({"type": "float", "result": 1.0})
+        for _ in range(depth):
+            nested = [nested]
+
+        resolved = WithUnresolvedSteps.with_resolved_steps(nested, workspace)
+        for _ in range(depth):
+            assert isinstance(resolved, list) and len(resolved) == 1
+            resolved = resolved[0]
+        assert resolved == 1.0
+
     def test_functional_step(self):
         class Bar(FromParams):
             def __init__(self, x: int):